@@ -0,0 +1,77 @@
+import { assert, assertEquals } from './testUtils.ts';
+import {
+    cosineSimilarity,
+    decodeQuantizedEmbedding,
+    dotProduct,
+    encodeQuantizedEmbedding,
+    normalizeVector,
+    quantizeEmbedding,
+    quantizedDot,
+    topKIndices,
+    vectorNorm
+} from './ai.ts';
+
+Deno.test('cosineSimilarity returns 1 for parallel vectors and 0 for orthogonal', () => {
+    assertEquals(cosineSimilarity([1, 0], [2, 0]), 1);
+    assertEquals(cosineSimilarity([1, 0], [0, 3]), 0);
+});
+
+Deno.test('cosineSimilarity returns 0 for empty or zero vectors', () => {
+    assertEquals(cosineSimilarity([], [1, 2]), 0);
+    assertEquals(cosineSimilarity([0, 0], [1, 2]), 0);
+});
+
+Deno.test('cosineSimilarity with a precomputed norm matches the two-pass result', () => {
+    const a = [0.3, -0.7, 0.2];
+    const b = [0.5, 0.1, -0.4];
+    const withNorm = cosineSimilarity(a, b, vectorNorm(a));
+    assert(Math.abs(withNorm - cosineSimilarity(a, b)) < 1e-12);
+    assertEquals(cosineSimilarity(a, b, 0), 0);
+});
+
+Deno.test('vectorNorm computes the Euclidean norm', () => {
+    assertEquals(vectorNorm([3, 4]), 5);
+    assertEquals(vectorNorm([]), 0);
+});
+
+Deno.test('normalizeVector produces a unit vector', () => {
+    const unit = normalizeVector([3, 4]);
+    assertEquals(unit.length, 2);
+    assert(Math.abs(unit[0] - 0.6) < 1e-12);
+    assert(Math.abs(unit[1] - 0.8) < 1e-12);
+});
+
+Deno.test('normalizeVector leaves zero vectors untouched', () => {
+    const unit = normalizeVector([0, 0, 0]);
+    assertEquals([...unit], [0, 0, 0]);
+});
+
+Deno.test('dotProduct of pre-normalized vectors matches cosineSimilarity', () => {
+    const a = [1, 2, 3];
+    const b = [4, 5, 6];
+    const dot = dotProduct(normalizeVector(a), normalizeVector(b));
+    assert(Math.abs(dot - cosineSimilarity(a, b)) < 1e-12);
+});
+
+Deno.test('topKIndices selects the k best scores in descending order', () => {
+    const scores = [0.1, 0.9, 0.5, 0.7, 0.3];
+    assertEquals(topKIndices(scores, 3), [1, 3, 2]);
+});
+
+Deno.test('topKIndices handles k larger than the score count and k of zero', () => {
+    assertEquals(topKIndices([0.2, 0.8], 5), [1, 0]);
+    assertEquals(topKIndices([0.2, 0.8], 0), []);
+});
+
+Deno.test('quantizeEmbedding survives the bytea encode/decode round-trip', () => {
+    const quantized = quantizeEmbedding([0.5, -0.25, 0.75, -1]);
+    const decoded = decodeQuantizedEmbedding(encodeQuantizedEmbedding(quantized));
+    assertEquals([...decoded], [...quantized]);
+});
+
+Deno.test('quantizedDot approximates cosine similarity of the original vectors', () => {
+    const a = [0.12, -0.34, 0.56, 0.78, -0.9];
+    const b = [0.9, 0.1, -0.2, 0.4, 0.3];
+    const approx = quantizedDot(quantizeEmbedding(a), quantizeEmbedding(b));
+    assert(Math.abs(approx - cosineSimilarity(a, b)) < 0.02);
+});
@@ -5,6 +5,7 @@ import {
     OPENAI_EMBED_MODEL,
     OPENAI_MODEL
 } from './env.ts';
+import { cacheGet, cacheKey, cacheSet, withCache } from './llmCache.ts';
 
 const OPENAI_HEADERS = {
     Authorization: `Bearer ${OPENAI_API_KEY}`,
@@ -90,7 +91,7 @@ async function* streamOpenAIChat(prompt: string): AsyncGenerator<string, void, u
     }
 }
 
-async function callOpenAIEmbedding(text: string): Promise<number[]> {
+async function callOpenAIEmbeddings(texts: string[]): Promise<number[][]> {
     if (!OPENAI_API_KEY) {
         throw new Error('OPENAI_API_KEY is not configured');
     }
@@ -99,7 +100,7 @@ async function callOpenAIEmbedding(text: string): Promise<number[]> {
         headers: OPENAI_HEADERS,
         body: JSON.stringify({
             model: OPENAI_EMBED_MODEL,
-            input: [text]
+            input: texts
         })
     });
     if (!response.ok) {
@@ -107,15 +108,18 @@ async function callOpenAIEmbedding(text: string): Promise<number[]> {
         throw new Error(`OpenAI embeddings failed: ${response.status} ${body}`);
     }
     const payload = await response.json();
-    const embedding = payload.data?.[0]?.embedding;
-    return Array.isArray(embedding) ? embedding.map((value: number) => Number(value)) : [];
+    const data = Array.isArray(payload.data) ? payload.data : [];
+    return texts.map((_, index) => {
+        const embedding = data[index]?.embedding;
+        return Array.isArray(embedding) ? embedding.map((value: number) => Number(value)) : [];
+    });
 }
 
 export async function generateContent(prompt: string): Promise<string> {
     if (AI_PROVIDER !== 'openai') {
         throw new Error(`Unsupported AI_PROVIDER: ${AI_PROVIDER}`);
     }
-    return await callOpenAIChat(prompt);
+    return await withCache(OPENAI_MODEL, prompt, () => callOpenAIChat(prompt));
 }
 
 export async function* streamContent(prompt: string): AsyncGenerator<string, void, unknown> {
@@ -125,15 +129,72 @@ export async function* streamContent(prompt: string): AsyncGenerator<string, voi
     yield* streamOpenAIChat(prompt);
 }
 
-export async function embedText(text: string): Promise<number[]> {
-    if (!text.trim()) {
+// OpenAI accepts batched embedding inputs; stay well under the API item limit
+const EMBED_BATCH_SIZE = 96;
+
+/**
+ * Embed several texts in as few provider calls as possible. Cached entries are
+ * resolved first, and only the misses are sent, in batches of up to 96 inputs
+ * per request. Empty texts map to empty embeddings without a provider call.
+ */
+export async function embedTexts(texts: string[]): Promise<number[][]> {
+    if (texts.length === 0) {
         return [];
     }
     if (AI_PROVIDER !== 'openai') {
         throw new Error(`Unsupported AI_PROVIDER: ${AI_PROVIDER}`);
     }
-    const normalized = text.replace(/\s+/g, ' ').trim();
-    return await callOpenAIEmbedding(normalized);
+    // No whitespace rewriting: collapsing newlines before embedding was advice
+    // for long-retired models, and the regex pass copied the full input text.
+    const normalized = texts.map((text) => text.trim());
+    const results: number[][] = normalized.map(() => []);
+
+    const keys = await Promise.all(
+        normalized.map((text) => (text ? cacheKey(OPENAI_EMBED_MODEL, text) : null))
+    );
+    const cached = await Promise.all(
+        keys.map((key) => (key ? cacheGet<number[]>(key) : Promise.resolve(null)))
+    );
+
+    const misses: number[] = [];
+    for (let i = 0; i < normalized.length; i += 1) {
+        if (!normalized[i]) {
+            continue;
+        }
+        const hit = cached[i];
+        // A cached empty array is a poisoned entry, not a hit - retry it
+        if (hit && hit.length > 0) {
+            results[i] = hit;
+        } else {
+            misses.push(i);
+        }
+    }
+
+    for (let start = 0; start < misses.length; start += EMBED_BATCH_SIZE) {
+        const batch = misses.slice(start, start + EMBED_BATCH_SIZE);
+        const embeddings = await callOpenAIEmbeddings(batch.map((index) => normalized[index]));
+        await Promise.all(
+            batch.map((index, offset) => {
+                results[index] = embeddings[offset] ?? [];
+                // Only cache real embeddings; a short or missing data entry
+                // from the provider must not be served for the full TTL
+                if (!results[index].length) {
+                    return Promise.resolve();
+                }
+                return cacheSet(keys[index] as string, OPENAI_EMBED_MODEL, results[index]);
+            })
+        );
+    }
+
+    return results;
+}
+
+export async function embedText(text: string): Promise<number[]> {
+    if (!text.trim()) {
+        return [];
+    }
+    const [embedding] = await embedTexts([text]);
+    return embedding ?? [];
 }
 
 import { summarizePrompt, tagsPrompt } from './prompts.ts';
@@ -179,31 +240,178 @@ export async function ensureTags(
     return parseTags(suggestion);
 }
 
+/** The exact text an embedding is computed from; also what embedding_hash covers */
+export function embeddingSource(parts: Array<string | undefined>): string {
+    return parts.filter((part) => typeof part === 'string' && part.trim()).join('\n');
+}
+
 export async function computeEmbedding(parts: Array<string | undefined>): Promise<number[]> {
-    const source = parts.filter((part) => typeof part === 'string' && part.trim()).join('\n');
+    const source = embeddingSource(parts);
     if (!source) {
         return [];
     }
     return await embedText(source);
 }
 
-export function cosineSimilarity(a: number[], b: number[]): number {
+/**
+ * L2-normalize a vector into a Float64Array. Zero vectors are returned as-is.
+ * Scoring pre-normalized vectors reduces per-candidate work to a dot product.
+ */
+export function normalizeVector(vector: ArrayLike<number>): Float64Array {
+    const out = new Float64Array(vector.length);
+    let norm = 0;
+    for (let i = 0; i < vector.length; i += 1) {
+        const value = vector[i];
+        out[i] = value;
+        norm += value * value;
+    }
+    if (!norm) {
+        return out;
+    }
+    norm = Math.sqrt(norm);
+    for (let i = 0; i < out.length; i += 1) {
+        out[i] /= norm;
+    }
+    return out;
+}
+
+export function dotProduct(a: ArrayLike<number>, b: ArrayLike<number>): number {
     const length = Math.min(a.length, b.length);
-    if (!length) {
+    let dot = 0;
+    for (let i = 0; i < length; i += 1) {
+        dot += a[i] * b[i];
+    }
+    return dot;
+}
+
+export function vectorNorm(vector: ArrayLike<number>): number {
+    let norm = 0;
+    for (let i = 0; i < vector.length; i += 1) {
+        norm += vector[i] * vector[i];
+    }
+    return Math.sqrt(norm);
+}
+
+/**
+ * Callers scoring one query against many candidates should pass the query's
+ * precomputed norm (see vectorNorm) so it isn't re-accumulated per candidate.
+ */
+export function cosineSimilarity(a: number[], b: number[], precomputedNormA?: number): number {
+    const length = Math.min(a.length, b.length);
+    if (!length || precomputedNormA === 0) {
         return 0;
     }
     let dot = 0;
     let normA = 0;
     let normB = 0;
-    for (let i = 0; i < length; i += 1) {
-        const av = a[i] ?? 0;
-        const bv = b[i] ?? 0;
-        dot += av * bv;
-        normA += av * av;
-        normB += bv * bv;
+    if (precomputedNormA !== undefined) {
+        for (let i = 0; i < length; i += 1) {
+            const bv = b[i];
+            dot += a[i] * bv;
+            normB += bv * bv;
+        }
+        normA = precomputedNormA * precomputedNormA;
+    } else {
+        for (let i = 0; i < length; i += 1) {
+            const av = a[i];
+            const bv = b[i];
+            dot += av * bv;
+            normA += av * av;
+            normB += bv * bv;
+        }
     }
     if (!normA || !normB) {
         return 0;
     }
     return dot / (Math.sqrt(normA) * Math.sqrt(normB));
 }
+
+const QUANT_SCALE = 127;
+
+/**
+ * Quantize an embedding to int8: L2-normalize, scale by 127, round.
+ * A quarter of the float32 bytes at rest and on the wire, with negligible
+ * cosine error on normalized embeddings.
+ */
+export function quantizeEmbedding(embedding: ArrayLike<number>): Int8Array {
+    const unit = normalizeVector(embedding);
+    const out = new Int8Array(unit.length);
+    for (let i = 0; i < unit.length; i += 1) {
+        out[i] = Math.round(unit[i] * QUANT_SCALE);
+    }
+    return out;
+}
+
+export function dequantizeEmbedding(quantized: Int8Array): Float64Array {
+    const out = new Float64Array(quantized.length);
+    for (let i = 0; i < quantized.length; i += 1) {
+        out[i] = quantized[i] / QUANT_SCALE;
+    }
+    return out;
+}
+
+/**
+ * Dot product of two quantized embeddings, rescaled to the unit-vector range.
+ * Approximates cosine similarity since quantized vectors are near-unit length.
+ */
+export function quantizedDot(a: Int8Array, b: Int8Array): number {
+    const length = Math.min(a.length, b.length);
+    let dot = 0;
+    for (let i = 0; i < length; i += 1) {
+        dot += a[i] * b[i];
+    }
+    return dot / (QUANT_SCALE * QUANT_SCALE);
+}
+
+/** Encode a quantized embedding as a Postgres bytea hex literal. */
+export function encodeQuantizedEmbedding(quantized: Int8Array): string {
+    const bytes = new Uint8Array(quantized.buffer, quantized.byteOffset, quantized.length);
+    let hex = '\\x';
+    for (let i = 0; i < bytes.length; i += 1) {
+        hex += bytes[i].toString(16).padStart(2, '0');
+    }
+    return hex;
+}
+
+export function decodeQuantizedEmbedding(encoded: string): Int8Array {
+    const hex = encoded.startsWith('\\x') ? encoded.slice(2) : encoded;
+    const bytes = new Uint8Array(hex.length >> 1);
+    for (let i = 0; i < bytes.length; i += 1) {
+        bytes[i] = Number.parseInt(hex.slice(i * 2, i * 2 + 2), 16);
+    }
+    return new Int8Array(bytes.buffer);
+}
+
+/**
+ * Indices of the k highest scores, sorted descending. Partial selection over a
+ * bounded candidate list instead of sorting all n scores for small k.
+ */
+export function topKIndices(scores: ArrayLike<number>, k: number): number[] {
+    if (k <= 0) {
+        return [];
+    }
+    const best: number[] = [];
+    for (let i = 0; i < scores.length; i += 1) {
+        if (best.length < k) {
+            best.push(i);
+            if (best.length === k) {
+                best.sort((x, y) => scores[y] - scores[x]);
+            }
+            continue;
+        }
+        if (scores[i] <= scores[best[k - 1]]) {
+            continue;
+        }
+        // Insert into the sorted top-k, evicting the current minimum.
+        let pos = k - 1;
+        while (pos > 0 && scores[i] > scores[best[pos - 1]]) {
+            best[pos] = best[pos - 1];
+            pos -= 1;
+        }
+        best[pos] = i;
+    }
+    if (best.length < k) {
+        best.sort((x, y) => scores[y] - scores[x]);
+    }
+    return best;
+}
@@ -41,7 +41,13 @@ export function normalizeTags(tags: unknown): string[] {
     return [];
 }
 
-export function serializeBookmark(row: BookmarkWithTags) {
+/** Rows from projected queries may omit the heavy columns entirely */
+type SerializableBookmark = Omit<BookmarkWithTags, 'raw_content' | 'embedding'> & {
+    raw_content?: string | null;
+    embedding?: number[] | null;
+};
+
+export function serializeBookmark(row: SerializableBookmark) {
     return {
         id: row.id,
         userId: row.user_id,
@@ -1,17 +1,50 @@
-export const AI_PROVIDER = (Deno.env.get('AI_PROVIDER') ?? 'openai').trim().toLowerCase();
-export const REQUIRE_AUTH = !['0', 'false', 'no', 'off'].includes(
-  (Deno.env.get('REQUIRE_AUTH') ?? 'true').trim().toLowerCase()
-);
-export const ANON_UID = Deno.env.get('ANON_UID') ?? 'dev-anon';
-export const OPENAI_API_KEY = Deno.env.get('OPENAI_API_KEY') ?? '';
-export const OPENAI_BASE_URL = Deno.env.get('OPENAI_BASE_URL') ?? 'https://api.openai.com/v1';
-export const OPENAI_MODEL = Deno.env.get('OPENAI_MODEL') ?? 'gpt-4o-mini';
-export const OPENAI_EMBED_MODEL =
-  Deno.env.get('OPENAI_EMBEDDING_MODEL') ?? 'text-embedding-3-small';
+type EnvConfig = {
+  readonly aiProvider: string;
+  readonly requireAuth: boolean;
+  readonly anonUid: string;
+  readonly openaiApiKey: string;
+  readonly openaiBaseUrl: string;
+  readonly openaiModel: string;
+  readonly openaiEmbedModel: string;
+  readonly serviceRoleKey: string;
+  readonly webhookSecret: string;
+  readonly allowedOrigins: string;
+};
 
-export const SERVICE_ROLE_KEY = Deno.env.get('SERVICE_ROLE_KEY') ?? '';
-export const WEBHOOK_SECRET = Deno.env.get('WEBHOOK_SECRET') ?? '';
-export const ALLOWED_ORIGINS = Deno.env.get('ALLOWED_ORIGINS') ?? '';
+function resolveEnv(): EnvConfig {
+  return {
+    aiProvider: (Deno.env.get('AI_PROVIDER') ?? 'openai').trim().toLowerCase(),
+    requireAuth: !['0', 'false', 'no', 'off'].includes(
+      (Deno.env.get('REQUIRE_AUTH') ?? 'true').trim().toLowerCase()
+    ),
+    anonUid: Deno.env.get('ANON_UID') ?? 'dev-anon',
+    openaiApiKey: Deno.env.get('OPENAI_API_KEY') ?? '',
+    openaiBaseUrl: Deno.env.get('OPENAI_BASE_URL') ?? 'https://api.openai.com/v1',
+    openaiModel: Deno.env.get('OPENAI_MODEL') ?? 'gpt-4o-mini',
+    openaiEmbedModel: Deno.env.get('OPENAI_EMBEDDING_MODEL') ?? 'text-embedding-3-small',
+    serviceRoleKey: Deno.env.get('SERVICE_ROLE_KEY') ?? '',
+    webhookSecret: Deno.env.get('WEBHOOK_SECRET') ?? '',
+    allowedOrigins: Deno.env.get('ALLOWED_ORIGINS') ?? ''
+  };
+}
+
+/**
+ * Environment resolved and parsed exactly once per isolate, frozen so nothing
+ * can mutate configuration at runtime. Warm invocations never touch Deno.env.
+ */
+export const env: EnvConfig = Object.freeze(resolveEnv());
+
+// Named constant re-exports for existing call sites.
+export const AI_PROVIDER = env.aiProvider;
+export const REQUIRE_AUTH = env.requireAuth;
+export const ANON_UID = env.anonUid;
+export const OPENAI_API_KEY = env.openaiApiKey;
+export const OPENAI_BASE_URL = env.openaiBaseUrl;
+export const OPENAI_MODEL = env.openaiModel;
+export const OPENAI_EMBED_MODEL = env.openaiEmbedModel;
+export const SERVICE_ROLE_KEY = env.serviceRoleKey;
+export const WEBHOOK_SECRET = env.webhookSecret;
+export const ALLOWED_ORIGINS = env.allowedOrigins;
 
 export function assertEnv(value: string, name: string): string {
   if (!value) {
@@ -26,7 +59,7 @@ export function assertEnv(value: string, name: string): string {
  */
 export function validateRequiredEnv(): void {
   const required: Array<[string, string]> = [
-    [OPENAI_API_KEY, 'OPENAI_API_KEY'],
+    [env.openaiApiKey, 'OPENAI_API_KEY'],
   ];
 
   for (const [value, name] of required) {
@@ -0,0 +1,80 @@
+import { supabaseAdmin } from './supabaseClient.ts';
+
+const CACHE_TABLE = 'llm_cache';
+const CACHE_TTL_MS = 7 * 24 * 60 * 60 * 1000; // 7 days
+
+/** Hit/miss counters for observability; logged by callers as needed. */
+export const cacheStats = { hits: 0, misses: 0 };
+
+export async function sha256Hex(input: string): Promise<string> {
+    const digest = await crypto.subtle.digest('SHA-256', new TextEncoder().encode(input));
+    return [...new Uint8Array(digest)].map(byte => byte.toString(16).padStart(2, '0')).join('');
+}
+
+/**
+ * Content-addressed cache key: SHA-256 over model and input. Including the
+ * model id means provider or model swaps invalidate cleanly.
+ */
+export async function cacheKey(model: string, input: string): Promise<string> {
+    return await sha256Hex(`${model}|${input}`);
+}
+
+/** Direct cache read; exported for batch callers that dedupe misses themselves. */
+export async function cacheGet<T>(key: string): Promise<T | null> {
+    try {
+        const { data, error } = await supabaseAdmin
+            .from(CACHE_TABLE)
+            .select('response')
+            .eq('key', key)
+            .gt('expires_at', new Date().toISOString())
+            .maybeSingle();
+        if (error || !data) {
+            cacheStats.misses += 1;
+            return null;
+        }
+        cacheStats.hits += 1;
+        return data.response as T;
+    } catch {
+        cacheStats.misses += 1;
+        return null;
+    }
+}
+
+export async function cacheSet(key: string, model: string, response: unknown): Promise<void> {
+    try {
+        const now = Date.now();
+        const { error } = await supabaseAdmin.from(CACHE_TABLE).upsert({
+            key,
+            model,
+            response,
+            created_at: new Date(now).toISOString(),
+            expires_at: new Date(now + CACHE_TTL_MS).toISOString()
+        });
+        if (error) {
+            console.warn('llm_cache write failed:', error.message);
+        }
+    } catch (error) {
+        // The cache must never fail the request it is accelerating.
+        console.warn('llm_cache write failed:', error);
+    }
+}
+
+/**
+ * Memoize a deterministic model call by content hash. Misses fall through to
+ * the provider and populate the cache with a 7-day TTL.
+ */
+export async function withCache<T>(model: string, input: string, compute: () => Promise<T>): Promise<T> {
+    const key = await cacheKey(model, input);
+    const cached = await cacheGet<T>(key);
+    if (cached !== null) {
+        return cached;
+    }
+    const fresh = await compute();
+    // Never persist empty results: a malformed provider response ('' or [])
+    // would otherwise be served for the full TTL instead of one request.
+    if (fresh === '' || (Array.isArray(fresh) && fresh.length === 0)) {
+        return fresh;
+    }
+    await cacheSet(key, model, fresh);
+    return fresh;
+}
@@ -1,28 +1,31 @@
+// Static instruction blocks are assembled once at module load instead of
+// being rebuilt (list + join) on every request.
+const SUMMARY_HEADER = [
+    'You are HyperMemo, a concise research assistant.',
+    'Summarize the following content in a single paragraph.',
+    'Focus ONLY on the provided content. Do not include external information or meta-commentary.',
+    'If the content is empty or insufficient, describe the topic based on the title.'
+].join('\n');
+
+const TAGS_HEADER =
+    'Suggest up to 5 concise tags (single words) describing the following page. Return comma-separated words only.';
+
+const SUMMARY_CONTENT_LIMIT = 8000;
+const TAGS_CONTENT_LIMIT = 4000;
+
+/** Slice only when over the limit so short inputs (the common case) skip the copy */
+function clip(text: string, limit: number): string {
+    return text.length > limit ? text.slice(0, limit) : text;
+}
+
 export function summarizePrompt(title: string, content: string, url: string): string {
-    const parts = [
-        'You are HyperMemo, a concise research assistant.',
-        'Summarize the following content in a single paragraph.',
-        'Focus ONLY on the provided content. Do not include external information or meta-commentary.',
-        'If the content is empty or insufficient, describe the topic based on the title.'
-    ];
-    if (title) {
-        parts.push(`Title: ${title}`);
-    }
-    if (url) {
-        parts.push(`URL: ${url}`);
-    }
-    parts.push('Content:');
-    parts.push(content.slice(0, 8000));
-    return parts.join('\n');
+    const titleLine = title ? `Title: ${title}\n` : '';
+    const urlLine = url ? `URL: ${url}\n` : '';
+    return `${SUMMARY_HEADER}\n${titleLine}${urlLine}Content:\n${clip(content, SUMMARY_CONTENT_LIMIT)}`;
 }
 
 export function tagsPrompt(title: string, content: string): string {
-    return [
-        'Suggest up to 5 concise tags (single words) describing the following page. Return comma-separated words only.',
-        `Title: ${title}`,
-        'Content:',
-        content.slice(0, 4000)
-    ].join('\n');
+    return `${TAGS_HEADER}\nTitle: ${title}\nContent:\n${clip(content, TAGS_CONTENT_LIMIT)}`;
 }
 
 type ConversationMessage = {
@@ -1,10 +1,9 @@
 export async function readJson<T = Record<string, unknown>>(req: Request): Promise<T | null> {
   try {
-    const text = await req.text();
-    if (!text) {
-      return null;
-    }
-    return JSON.parse(text) as T;
+    // Parse straight off the body stream instead of materializing an
+    // intermediate string first; empty/malformed bodies reject and fall
+    // through to null, matching the previous contract.
+    return (await req.json()) as T;
   } catch {
     return null;
   }
@@ -26,7 +26,7 @@ export const supabaseAdmin = new Proxy({} as SupabaseClient, {
     }
 });
 
-function extractBearer(req: Request): string | null {
+export function extractBearer(req: Request): string | null {
     const header = req.headers.get('Authorization') ?? req.headers.get('authorization') ?? '';
     if (!header.toLowerCase().startsWith('bearer ')) {
         return null;
@@ -35,6 +35,32 @@ function extractBearer(req: Request): string | null {
     return token || null;
 }
 
+// Verified tokens are cached by SHA-256 so repeat requests from the same
+// session skip the auth server round-trip. Entries are bounded by both the
+// token's own exp claim and a short TTL to limit revocation lag.
+const TOKEN_CACHE_MAX = 1000;
+const TOKEN_CACHE_TTL_MS = 5 * 60 * 1000;
+const tokenCache = new Map<string, { userId: string; expiresAt: number }>();
+
+async function hashToken(token: string): Promise<string> {
+    const digest = await crypto.subtle.digest('SHA-256', new TextEncoder().encode(token));
+    return [...new Uint8Array(digest)].map((byte) => byte.toString(16).padStart(2, '0')).join('');
+}
+
+/** Read the exp claim without verifying; used only to bound cache lifetime. */
+function tokenExpiryMs(token: string): number | null {
+    const parts = token.split('.');
+    if (parts.length !== 3) {
+        return null;
+    }
+    try {
+        const payload = JSON.parse(atob(parts[1].replace(/-/g, '+').replace(/_/g, '/')));
+        return typeof payload.exp === 'number' ? payload.exp * 1000 : null;
+    } catch {
+        return null;
+    }
+}
+
 export async function requireUserId(req: Request): Promise<string> {
     if (!REQUIRE_AUTH) {
         return ANON_UID;
@@ -43,9 +69,32 @@ export async function requireUserId(req: Request): Promise<string> {
     if (!token) {
         throw new Error('Missing Authorization bearer token');
     }
+
+    const tokenHash = await hashToken(token);
+    const now = Date.now();
+    const cached = tokenCache.get(tokenHash);
+    if (cached && cached.expiresAt > now) {
+        return cached.userId;
+    }
+
     const { data, error } = await supabaseAdmin.auth.getUser(token);
     if (error || !data?.user) {
+        tokenCache.delete(tokenHash);
         throw new Error('Invalid or expired access token');
     }
+
+    if (tokenCache.size >= TOKEN_CACHE_MAX) {
+        for (const [key, entry] of tokenCache) {
+            if (entry.expiresAt <= now) {
+                tokenCache.delete(key);
+            }
+        }
+        if (tokenCache.size >= TOKEN_CACHE_MAX) {
+            tokenCache.clear();
+        }
+    }
+    const expiresAt = Math.min(tokenExpiryMs(token) ?? Infinity, now + TOKEN_CACHE_TTL_MS);
+    tokenCache.set(tokenHash, { userId: data.user.id, expiresAt });
+
     return data.user.id;
 }
@@ -33,7 +33,7 @@ function ensureTitleUrl(payload: BookmarkPayload): { title: string; url: string
 async function fetchBookmarkWithTags(bookmarkId: string, userId: string): Promise<BookmarkWithTags | null> {
     const { data: bookmark, error: bookmarkError } = await supabaseAdmin
         .from('bookmarks')
-        .select('*')
+        .select(DETAIL_COLUMNS)
         .eq('id', bookmarkId)
         .eq('user_id', userId)
         .single();
@@ -127,6 +127,14 @@ async function deleteBookmark(userId: string, resourceId: string | null): Promis
 const DEFAULT_LIMIT = 50;
 const MAX_LIMIT = 200;
 
+// The list view never renders raw_content (detail views fetch the single
+// bookmark) and no response includes the embedding vector, so leave both
+// heavy columns out of the list query entirely.
+const LIST_COLUMNS = 'id, user_id, title, url, summary, created_at, updated_at';
+
+// Detail responses include rawContent but still never expose the embedding.
+const DETAIL_COLUMNS = `${LIST_COLUMNS}, raw_content`;
+
 async function listBookmarks(userId: string, resourceId: string | null, req: Request): Promise<Response> {
     if (resourceId) {
         const bookmarkWithTags = await fetchBookmarkWithTags(resourceId, userId);
@@ -144,7 +152,7 @@ async function listBookmarks(userId: string, resourceId: string | null, req: Req
     // Fetch bookmarks with pagination
     const { data: bookmarks, error, count } = await supabaseAdmin
         .from('bookmarks')
-        .select('*', { count: 'exact' })
+        .select(LIST_COLUMNS, { count: 'exact' })
         .eq('user_id', userId)
         .order('created_at', { ascending: false })
         .range(offset, offset + limit - 1);
@@ -1,5 +1,14 @@
 import { createClient } from "@supabase/supabase-js";
-import { computeEmbedding, ensureSummary, ensureTags } from '../_shared/ai.ts';
+import {
+    embeddingSource,
+    embedText,
+    encodeQuantizedEmbedding,
+    ensureSummary,
+    ensureTags,
+    quantizeEmbedding
+} from '../_shared/ai.ts';
+import { sha256Hex } from '../_shared/llmCache.ts';
+import { extractBearer } from '../_shared/supabaseClient.ts';
 import { syncBookmarkTags } from '../_shared/tagUtils.ts';
 import { WEBHOOK_SECRET } from '../_shared/env.ts';
 import { getCorsHeaders } from '../_shared/cors.ts';
@@ -22,6 +31,7 @@ type BookmarkRecord = {
     summary: string | null;
     raw_content: string | null;
     embedding: string | null; // pgvector returns string or array
+    embedding_hash?: string | null;
 };
 
 type WebhookPayload = {
@@ -168,23 +178,48 @@ async function processBookmarkRecord(record: BookmarkRecord) {
     // 1. Fetch current tags (user might have added some)
     const currentTags = await fetchCurrentTags(id);
 
-    // 2. Generate AI content
+    // 2. Generate AI content. Summary and tags are independent LLM calls, so
+    // run them concurrently; the embedding only depends on the summary, so it
+    // is kicked off as soon as the summary resolves while tags are still pending.
     console.log(`Generating summary and tags for ${id}...`);
+    const tagsPromise = ensureTags(title, rawContent, currentTags);
+    // Mark the pending rejection as handled so a summary failure below
+    // doesn't surface a second, unhandled rejection from the tags call.
+    tagsPromise.catch(() => {});
     const generatedSummary = await ensureSummary(title, rawContent, url, currentSummary);
-    const generatedTags = await ensureTags(title, rawContent, currentTags);
 
-    // 3. Compute Embedding
-    console.log(`Computing embedding for ${id}...`);
-    const embedding = await computeEmbedding([title, generatedSummary, rawContent]);
+    // 3. Compute embedding, unless the text it derives from is unchanged from
+    // the stored embedding_hash - the embedding call is the most expensive
+    // step on the reprocess path and a no-op edit shouldn't pay for it.
+    const source = embeddingSource([title, generatedSummary, rawContent]);
+    const embeddingHash = source ? await sha256Hex(source) : null;
+    const embeddingUnchanged =
+        embeddingHash !== null && embeddingHash === record.embedding_hash && record.embedding != null;
+
+    if (embeddingUnchanged) {
+        console.log(`Embedding source unchanged for ${id}, reusing stored embedding`);
+    } else {
+        console.log(`Computing embedding for ${id}...`);
+    }
+    const [generatedTags, embedding] = await Promise.all([
+        tagsPromise,
+        embeddingUnchanged || !source ? Promise.resolve<number[]>([]) : embedText(source)
+    ]);
 
     // 4. Update Bookmark Record
+    const update: Record<string, unknown> = {
+        summary: generatedSummary,
+        raw_content: rawContent
+    };
+    if (!embeddingUnchanged) {
+        update.embedding = embedding;
+        // Dual-write the int8-quantized copy during the migration window
+        update.embedding_q8 = embedding.length ? encodeQuantizedEmbedding(quantizeEmbedding(embedding)) : null;
+        update.embedding_hash = embedding.length ? embeddingHash : null;
+    }
     const { error: updateError } = await supabaseAdmin
         .from('bookmarks')
-        .update({
-            summary: generatedSummary,
-            raw_content: rawContent,
-            embedding: embedding
-        })
+        .update(update)
         .eq('id', id);
 
     if (updateError) {
@@ -230,15 +265,11 @@ Deno.serve(async (req: Request): Promise<Response> => {
         }
 
         // 2. Check for User Request (Authorization header)
-        const authHeader = req.headers.get('Authorization');
-        if (authHeader) {
-            // Verify user
-            const supabaseClient = createClient(
-                supabaseUrl,
-                Deno.env.get('SUPABASE_ANON_KEY') ?? '',
-                { global: { headers: { Authorization: authHeader } } }
-            );
-            const { data: { user }, error } = await supabaseClient.auth.getUser();
+        const token = extractBearer(req);
+        if (token) {
+            // Verify the token against the module-level admin client instead of
+            // constructing a fresh client (and connection pool) per request.
+            const { data: { user }, error } = await supabaseAdmin.auth.getUser(token);
 
             if (error || !user) {
                 return new Response(JSON.stringify({ error: "Unauthorized" }), { status: 401, headers: jsonHeaders });
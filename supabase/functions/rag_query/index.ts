@@ -2,7 +2,18 @@ import { handleCors, corsHeaders } from '../_shared/cors.ts';
 import { jsonResponse } from '../_shared/response.ts';
 import { requireUserId, supabaseAdmin } from '../_shared/supabaseClient.ts';
 import { readJson } from '../_shared/request.ts';
-import { embedText, streamContent, generateContent } from '../_shared/ai.ts';
+import {
+    decodeQuantizedEmbedding,
+    dotProduct,
+    embedText,
+    streamContent,
+    generateContent,
+    normalizeVector,
+    quantizeEmbedding,
+    quantizedDot,
+    topKIndices,
+    vectorNorm
+} from '../_shared/ai.ts';
 import { ragPrompt, rerankPrompt } from '../_shared/prompts.ts';
 
 type ConversationMessage = {
@@ -24,7 +35,8 @@ type RpcMatch = {
     title: string;
     url: string;
     summary: string;
-    raw_content: string;
+    /** Only populated for direct bookmark fetches; search results omit it */
+    raw_content?: string;
     tags: string[];
     created_at: string;
     updated_at: string;
@@ -79,6 +91,148 @@ async function resolveTagIds(userId: string, tagNames: string[]): Promise<string
     return data?.map(t => t.id) || [];
 }
 
+const MATCH_THRESHOLD = 0.1; // Low threshold to get enough candidates for re-ranking
+const MATCH_COUNT = 50;      // Fetch top 50 to allow for re-ranking
+
+/** pgvector returns embeddings as a string through PostgREST */
+function parseEmbedding(value: unknown): number[] {
+    if (Array.isArray(value)) {
+        return value as number[];
+    }
+    if (typeof value === 'string') {
+        try {
+            return JSON.parse(value);
+        } catch {
+            return [];
+        }
+    }
+    return [];
+}
+
+type LocalScoringRow = {
+    id: string;
+    user_id: string;
+    title: string | null;
+    url: string;
+    summary: string | null;
+    embedding: unknown;
+    embedding_q8: string | null;
+    created_at: string;
+    updated_at: string;
+    bookmark_tags: Array<{ tags: { id: string; name: string } | { id: string; name: string }[] | null }> | null;
+};
+
+type LocalCandidate = {
+    row: LocalScoringRow;
+    tags: { id: string; name: string }[];
+    /** int8-quantized embedding, decoded once at cache-load time */
+    quantized: Int8Array | null;
+    /** Pre-normalized float embedding for rows without a quantized copy yet */
+    unit: Float64Array | null;
+};
+
+// Warm isolates are reused across invocations, so the fallback's candidate set
+// (embeddings parsed, tags flattened) is memoized per user with a short TTL.
+// Bookmark writes happen in other functions/isolates, so freshness is bounded
+// by the TTL rather than explicit invalidation.
+const EMBED_CACHE_TTL_MS = 60 * 1000;
+const EMBED_CACHE_MAX_USERS = 50;
+const embedCache = new Map<string, { candidates: LocalCandidate[]; fetchedAt: number }>();
+
+async function loadLocalCandidates(userId: string): Promise<LocalCandidate[]> {
+    const now = Date.now();
+    const cached = embedCache.get(userId);
+    if (cached && now - cached.fetchedAt < EMBED_CACHE_TTL_MS) {
+        return cached.candidates;
+    }
+
+    const { data, error } = await supabaseAdmin
+        .from('bookmarks')
+        .select('id, user_id, title, url, summary, embedding, embedding_q8, created_at, updated_at, bookmark_tags(tags(id, name))')
+        .eq('user_id', userId)
+        .not('embedding', 'is', null);
+
+    if (error) {
+        throw new Error(error.message);
+    }
+
+    const rows = (data || []) as LocalScoringRow[];
+    const candidates = rows.map(row => {
+        // Prefer the int8 copy: a quarter of the bytes and no JSON float
+        // parsing; rows written before the dual-write migration fall back to
+        // the float vector.
+        const quantized = row.embedding_q8 ? decodeQuantizedEmbedding(row.embedding_q8) : null;
+        return {
+            row,
+            tags: (row.bookmark_tags || []).flatMap(bt => {
+                if (Array.isArray(bt.tags)) return bt.tags;
+                return bt.tags ? [bt.tags] : [];
+            }),
+            quantized,
+            unit: quantized ? null : normalizeVector(parseEmbedding(row.embedding))
+        };
+    });
+
+    if (embedCache.size >= EMBED_CACHE_MAX_USERS) {
+        for (const [key, entry] of embedCache) {
+            if (now - entry.fetchedAt >= EMBED_CACHE_TTL_MS) {
+                embedCache.delete(key);
+            }
+        }
+        if (embedCache.size >= EMBED_CACHE_MAX_USERS) {
+            embedCache.clear();
+        }
+    }
+    embedCache.set(userId, { candidates, fetchedAt: now });
+
+    return candidates;
+}
+
+/**
+ * Fallback: score bookmarks in the function when the match_bookmarks RPC
+ * (pgvector index) is unavailable, e.g. before the migration has been applied.
+ */
+async function searchBookmarksLocal(
+    userId: string,
+    queryEmbedding: number[],
+    tagIds: string[]
+): Promise<RpcMatch[]> {
+    const candidates = (await loadLocalCandidates(userId)).filter(
+        ({ tags }) => tagIds.length === 0 || tags.some(tag => tagIds.includes(tag.id))
+    );
+
+    if (!vectorNorm(queryEmbedding)) {
+        return [];
+    }
+    // Candidates are pre-normalized/decoded at cache-load time, so each query
+    // costs one query normalization plus a dot product per candidate.
+    const queryUnit = normalizeVector(queryEmbedding);
+    const queryQ8 = quantizeEmbedding(queryEmbedding);
+    const scores = candidates.map(({ quantized, unit }) => {
+        if (quantized) {
+            return quantizedDot(queryQ8, quantized);
+        }
+        return unit ? dotProduct(queryUnit, unit) : 0;
+    });
+
+    return topKIndices(scores, MATCH_COUNT)
+        .filter(index => scores[index] > MATCH_THRESHOLD)
+        .map(index => {
+            const { row, tags } = candidates[index];
+            return {
+                id: row.id,
+                user_id: row.user_id,
+                title: row.title || '',
+                url: row.url,
+                summary: row.summary || '',
+                tags: tags.map(tag => tag.name),
+                created_at: row.created_at,
+                updated_at: row.updated_at,
+                similarity: scores[index]
+            };
+        });
+}
+
 /**
  * Search bookmarks using pgvector RPC
  */
@@ -89,14 +243,15 @@ async function searchBookmarks(
 ): Promise<RpcMatch[]> {
     const { data, error } = await supabaseAdmin.rpc('match_bookmarks', {
         query_embedding: queryEmbedding,
-        match_threshold: 0.1, // Low threshold to get enough candidates for re-ranking
-        match_count: 50,      // Fetch top 50 to allow for re-ranking
+        match_threshold: MATCH_THRESHOLD,
+        match_count: MATCH_COUNT,
         filter_user_id: userId,
         filter_tag_ids: tagIds.length > 0 ? tagIds : null
     });
 
     if (error) {
-        throw new Error(error.message);
+        console.warn('match_bookmarks RPC unavailable, falling back to local scoring:', error.message);
+        return await searchBookmarksLocal(userId, queryEmbedding, tagIds);
     }
 
     return (data || []) as RpcMatch[];
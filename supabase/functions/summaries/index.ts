@@ -1,16 +1,48 @@
-import { handleCors } from '../_shared/cors.ts';
+import { handleCors, corsHeaders } from '../_shared/cors.ts';
 import { jsonResponse } from '../_shared/response.ts';
 import { requireUserId } from '../_shared/supabaseClient.ts';
 import { readJson } from '../_shared/request.ts';
-import { generateContent, parseTags } from '../_shared/ai.ts';
+import { generateContent, parseTags, streamContent } from '../_shared/ai.ts';
 import { summarizePrompt, tagsPrompt } from '../_shared/prompts.ts';
 
 type SummaryPayload = {
     title?: string;
     content?: string;
     url?: string;
+    stream?: boolean;
 };
 
+/**
+ * Stream a summary via SSE so the client sees the first tokens immediately
+ * instead of waiting for the full completion. Same event shape as rag_query.
+ */
+function streamSummaryResponse(prompt: string): Response {
+    const body = new ReadableStream({
+        async start(controller) {
+            const encoder = new TextEncoder();
+            try {
+                for await (const chunk of streamContent(prompt)) {
+                    controller.enqueue(encoder.encode(`data: ${JSON.stringify({ type: 'content', content: chunk })}\n\n`));
+                }
+                controller.enqueue(encoder.encode(`data: ${JSON.stringify({ type: 'done' })}\n\n`));
+            } catch (error) {
+                controller.enqueue(encoder.encode(`data: ${JSON.stringify({ type: 'error', error: error instanceof Error ? error.message : 'Unknown error' })}\n\n`));
+            } finally {
+                controller.close();
+            }
+        }
+    });
+
+    return new Response(body, {
+        headers: {
+            ...corsHeaders,
+            'Content-Type': 'text/event-stream',
+            'Cache-Control': 'no-cache',
+            'Connection': 'keep-alive'
+        }
+    });
+}
+
 /**
  * Generate tags for content using AI
  */
@@ -42,6 +74,11 @@ async function handleSummaryGeneration(payload: SummaryPayload): Promise<Respons
     }
 
     const prompt = summarizePrompt(title, content, url);
+
+    if (payload.stream) {
+        return streamSummaryResponse(prompt);
+    }
+
     const summary = await generateContent(prompt);
 
     return jsonResponse(200, { summary });
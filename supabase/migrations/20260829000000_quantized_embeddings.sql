@@ -0,0 +1,4 @@
+-- Store an int8-quantized copy of the embedding alongside the float vector.
+-- 1536 bytes instead of ~6KB per bookmark; dual-written for one release so
+-- existing readers keep working before any cutover.
+alter table public.bookmarks add column if not exists embedding_q8 bytea;
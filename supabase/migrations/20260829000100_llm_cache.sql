@@ -0,0 +1,32 @@
+-- Content-addressed cache for deterministic LLM generations and embeddings.
+-- Keyed by sha256(model|input) so identical requests skip the provider call.
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    response JSONB NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    expires_at TIMESTAMPTZ NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_llm_cache_expires_at ON llm_cache(expires_at);
+
+-- Only Edge Functions (service role) touch this table; no user policies.
+ALTER TABLE llm_cache ENABLE ROW LEVEL SECURITY;
+
+-- Sweep expired entries daily at 3:30 AM (UTC), after the tags cleanup job
+create or replace function cleanup_expired_llm_cache()
+returns void
+language plpgsql
+security definer
+as $$
+begin
+  delete from llm_cache
+  where expires_at < now();
+end;
+$$;
+
+select cron.schedule(
+  'cleanup-expired-llm-cache',
+  '30 3 * * *',
+  $$select cleanup_expired_llm_cache()$$
+);
@@ -0,0 +1,63 @@
+-- Drop raw_content from the match_bookmarks result set. The RAG search path
+-- only needs title/summary/tags for re-ranking and answer sources, but the
+-- function was shipping the largest column for all 50 candidates on every
+-- query. Full payloads are still available per-bookmark where needed.
+-- Changing the OUT columns requires dropping the function first.
+drop function if exists match_bookmarks(vector, float, int, uuid, uuid[]);
+
+create or replace function match_bookmarks(
+  query_embedding vector(1536),
+  match_threshold float,
+  match_count int,
+  filter_user_id uuid,
+  filter_tag_ids uuid[] default null
+)
+returns table (
+  id uuid,
+  user_id uuid,
+  title text,
+  url text,
+  summary text,
+  tags text[],
+  created_at timestamptz,
+  updated_at timestamptz,
+  similarity float
+)
+language plpgsql
+as $$
+begin
+  return query
+  select
+    b.id,
+    b.user_id,
+    b.title,
+    b.url,
+    b.summary,
+    coalesce(
+      (
+        select array_agg(t.name)
+        from bookmark_tags bt
+        join tags t on t.id = bt.tag_id
+        where bt.bookmark_id = b.id
+      ),
+      '{}'::text[]
+    ) as tags,
+    b.created_at,
+    b.updated_at,
+    1 - (b.embedding <=> query_embedding) as similarity
+  from public.bookmarks b
+  where 1 - (b.embedding <=> query_embedding) > match_threshold
+  and b.user_id = filter_user_id
+  and (
+    filter_tag_ids is null
+    or
+    exists (
+      select 1 from bookmark_tags bt
+      where bt.bookmark_id = b.id
+      and bt.tag_id = any(filter_tag_ids)
+    )
+  )
+  order by b.embedding <=> query_embedding
+  limit match_count;
+end;
+$$;
@@ -0,0 +1,4 @@
+-- Hash of the text the embedding was computed from. Reprocessing compares it
+-- against the current title/summary/content and skips the embedding call when
+-- nothing the vector depends on has changed.
+alter table public.bookmarks add column if not exists embedding_hash text;